@@ -71,6 +71,12 @@ class Settings(BaseSettings):
         default=8000,
         validation_alias=AliasChoices("babblr_api_port", "port"),
     )
+    # Uvicorn worker processes outside dev mode (0 = max(2, cpu_count // 2)).
+    # Each worker loads its own Whisper model, so size this to available RAM/VRAM.
+    babblr_api_workers: int = Field(
+        default=1,
+        validation_alias=AliasChoices("babblr_api_workers", "workers"),
+    )
     babblr_conversation_database_url: str = Field(
         default="sqlite+aiosqlite:///./babblr.db",
         validation_alias=AliasChoices("babblr_conversation_database_url", "database_url"),
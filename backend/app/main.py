@@ -1,9 +1,15 @@
+import asyncio
+import hashlib
+import os
+import sys
+import time
 from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import ORJSONResponse, Response
 
 from app.config import settings
 from app.database.db import init_db
@@ -14,11 +20,39 @@ from app.services.whisper_service import whisper_service
 
 _STATIC_DIR = Path(__file__).resolve().parent / "static"
 
+# The favicon never changes while the server runs: load it once and let browsers
+# cache it for a year.
+_FAVICON_BYTES = (_STATIC_DIR / "favicon.svg").read_bytes()
+_FAVICON_HEADERS = {
+    "Cache-Control": "public, max-age=31536000, immutable",
+    "ETag": f'"{hashlib.blake2b(_FAVICON_BYTES, digest_size=8).hexdigest()}"',
+}
+
+# /health is polled frequently (load balancers, liveness probes); cache the payload
+# briefly so repeated polls don't each round-trip to Ollama.
+HEALTH_CACHE_TTL = 5.0  # seconds
+OLLAMA_PROBE_TIMEOUT = 1.5  # seconds
+
+# Circuit breaker: after this many consecutive probe failures, skip probing Ollama
+# for the cooldown period instead of waiting out the timeout on every poll.
+OLLAMA_BREAKER_THRESHOLD = 3
+OLLAMA_BREAKER_COOLDOWN = 30.0  # seconds
+
+_health_cache: dict[str, Any] = {"value": None, "expires": 0.0, "stale": None}
+_health_lock = asyncio.Lock()
+_ollama_breaker: dict[str, Any] = {"failures": 0, "open_until": 0.0}
+
+# Liveness body never changes, so serialize it once. A fresh Response is still built
+# per request because middleware (e.g. CORS) mutates response headers in place.
+_LIVE_BODY = ORJSONResponse({"status": "ok"}).body
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize database on startup."""
+    """Initialize database (and dev-mode audio storage) on startup."""
     await init_db()
+    if settings.babblr_dev_mode:
+        stt.init_audio_storage()
     yield
 
 
@@ -28,6 +62,7 @@ app = FastAPI(
     description="Language learning app with AI tutor - Backend API",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -35,8 +70,11 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=[settings.babblr_frontend_url, "http://localhost:3000", "http://localhost:5173"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists (rather than "*") keep preflight responses static, and max_age
+    # lets browsers cache them instead of re-preflighting every request.
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,
 )
 
 # Include routers
@@ -46,21 +84,28 @@ app.include_router(tts.router)
 app.include_router(stt.router)
 
 
+def _favicon_response(request: Request) -> Response:
+    """Build the favicon response, answering 304 when the client's ETag matches."""
+    if request.headers.get("if-none-match") == _FAVICON_HEADERS["ETag"]:
+        return Response(status_code=304, headers=_FAVICON_HEADERS)
+    return Response(content=_FAVICON_BYTES, media_type="image/svg+xml", headers=_FAVICON_HEADERS)
+
+
 @app.get("/favicon.svg", include_in_schema=False)
-async def favicon_svg():
+async def favicon_svg(request: Request):
     """Serve the Babblr favicon as an SVG.
 
     The SVG is stored under app/static to keep backend assets co-located
     with the FastAPI app, and to avoid relying on the current working
     directory when the server is started.
     """
-    return FileResponse(_STATIC_DIR / "favicon.svg", media_type="image/svg+xml")
+    return _favicon_response(request)
 
 
 @app.get("/favicon.ico", include_in_schema=False)
-async def favicon_ico():
-    """Redirect /favicon.ico to the SVG favicon to avoid 404s in browsers."""
-    return RedirectResponse(url="/favicon.svg", status_code=307)
+async def favicon_ico(request: Request):
+    """Serve the SVG favicon at /favicon.ico too, avoiding a redirect round-trip."""
+    return _favicon_response(request)
 
 
 @app.get("/")
@@ -69,71 +114,157 @@ async def root():
     return {"status": "ok", "service": "Babblr API", "version": "1.0.0"}
 
 
-@app.get("/health")
-async def health_check():
-    """Detailed health check."""
-    # Check if Claude API key is properly configured (not placeholder)
-    claude_configured = (
-        settings.anthropic_api_key and settings.anthropic_api_key != "your_anthropic_api_key_here"
-    )
+# Parts of the /health payload that are fixed for the process lifetime (settings and
+# service capabilities don't change at runtime), built once at import.
+_CLAUDE_CFG = (
+    "configured"
+    if settings.anthropic_api_key and settings.anthropic_api_key != "your_anthropic_api_key_here"
+    else "not configured"
+)
+_EDGE_TTS_AVAILABLE = tts_service.is_edge_tts_available()
+_HEALTH_WHISPER_BASE: dict[str, Any] = {
+    "status": "loaded",
+    "current_model": settings.whisper_model,
+    "supported_models": whisper_service.get_available_models(),
+    "supported_locales": (
+        whisper_service.get_supported_locales()
+        if hasattr(whisper_service, "get_supported_locales")
+        else whisper_service.get_supported_languages()
+    ),
+}
+_HEALTH_OLLAMA_BASE: dict[str, Any] = {
+    "status": "configured",
+    "base_url": settings.ollama_base_url,
+    "configured_model": settings.ollama_model,
+}
+_HEALTH_TTS: dict[str, Any] = {
+    "status": "available" if _EDGE_TTS_AVAILABLE else "unavailable",
+    "backend": "edge-tts" if _EDGE_TTS_AVAILABLE else None,
+    "supported_locales": tts_service.get_supported_locales(),
+}
+
+
+async def _probe_ollama_models() -> list[str] | None:
+    """List Ollama models with a bounded timeout, behind a simple circuit breaker.
+
+    Returns:
+        Model names, or None if Ollama is unavailable or the breaker is open.
+    """
+    now = time.monotonic()
+    if now < _ollama_breaker["open_until"]:
+        return None
 
-    # Ollama model listing is best-effort: backend should still be healthy if Ollama is down.
-    ollama_available_models: list[str] | None = None
     try:
         ollama = ProviderFactory.get_provider("ollama")
-        if hasattr(ollama, "list_models"):
-            ollama_available_models = await ollama.list_models()
+        if not hasattr(ollama, "list_models"):
+            return None
+        models = await asyncio.wait_for(ollama.list_models(), timeout=OLLAMA_PROBE_TIMEOUT)
     except Exception:
-        ollama_available_models = None
+        _ollama_breaker["failures"] += 1
+        if _ollama_breaker["failures"] >= OLLAMA_BREAKER_THRESHOLD:
+            _ollama_breaker["open_until"] = now + OLLAMA_BREAKER_COOLDOWN
+        return None
+
+    _ollama_breaker["failures"] = 0
+    return models
+
+
+async def _build_health_payload() -> dict[str, Any]:
+    """Probe the services and build the /health payload.
+
+    If the Ollama probe fails (or is skipped because the circuit breaker is open)
+    and an earlier successful payload exists, that payload is returned with status
+    "degraded" instead.
+    """
+    # Ollama model listing is best-effort: backend should still be healthy if Ollama is down.
+    ollama_available_models = await _probe_ollama_models()
+    if ollama_available_models is None and _health_cache["stale"] is not None:
+        return {**_health_cache["stale"], "status": "degraded"}
 
     whisper_cuda = (
         whisper_service.get_cuda_info() if hasattr(whisper_service, "get_cuda_info") else {}
     )
 
-    return {
+    payload = {
         "status": "healthy",
         "database": "connected",
         "llm_provider": settings.llm_provider,
         "services": {
-            "whisper": {
-                "status": "loaded",
-                "current_model": settings.whisper_model,
-                "supported_models": whisper_service.get_available_models(),
-                "supported_locales": (
-                    whisper_service.get_supported_locales()
-                    if hasattr(whisper_service, "get_supported_locales")
-                    else whisper_service.get_supported_languages()
-                ),
-                "runtime": whisper_cuda,
-            },
-            "claude": "configured" if claude_configured else "not configured",
-            "ollama": {
-                "status": "configured",
-                "base_url": settings.ollama_base_url,
-                "configured_model": settings.ollama_model,
-                "available_models": ollama_available_models,
-            },  # Availability checked at request time
-            "tts": {
-                "status": "available" if tts_service.is_edge_tts_available() else "unavailable",
-                "backend": "edge-tts" if tts_service.is_edge_tts_available() else None,
-                "supported_locales": tts_service.get_supported_locales(),
-            },
+            "whisper": {**_HEALTH_WHISPER_BASE, "runtime": whisper_cuda},
+            "claude": _CLAUDE_CFG,
+            # Availability checked at request time
+            "ollama": {**_HEALTH_OLLAMA_BASE, "available_models": ollama_available_models},
+            "tts": _HEALTH_TTS,
         },
     }
+    if ollama_available_models is not None:
+        _health_cache["stale"] = payload
+    return payload
+
+
+@app.get("/health/live")
+async def health_live():
+    """Liveness probe: answers immediately without touching any dependency."""
+    return Response(content=_LIVE_BODY, media_type="application/json")
+
+
+@app.get("/health/ready")
+@app.get("/health")
+async def health_check():
+    """Readiness probe with detailed service status (Ollama, Whisper, TTS).
+
+    `/health` is kept as an alias of `/health/ready` for existing clients.
+
+    The payload is cached for HEALTH_CACHE_TTL seconds; concurrent pollers share a
+    single in-flight probe.
+    """
+    if time.monotonic() < _health_cache["expires"]:
+        return _health_cache["value"]
+
+    async with _health_lock:
+        # Another request may have refreshed the cache while we waited for the lock
+        if time.monotonic() < _health_cache["expires"]:
+            return _health_cache["value"]
+
+        payload = await _build_health_payload()
+        _health_cache["value"] = payload
+        _health_cache["expires"] = time.monotonic() + HEALTH_CACHE_TTL
+        return payload
+
+
+def _uvicorn_options() -> dict[str, Any]:
+    """Build uvicorn.run() options for the current mode.
+
+    Development mode runs a single auto-reloading worker. Otherwise reload is off,
+    the C-based uvloop/httptools implementations are used, and several workers can
+    run (BABBLR_API_WORKERS; 0 means max(2, cpu_count // 2)).
+    """
+    options: dict[str, Any] = {
+        "host": settings.babblr_api_host,
+        "port": settings.babblr_api_port,
+    }
+    if settings.babblr_dev_mode:
+        return {**options, "reload": True}
+
+    workers = settings.babblr_api_workers or max(2, (os.cpu_count() or 1) // 2)
+    return {
+        **options,
+        "reload": False,
+        # uvloop is not available on Windows
+        "loop": "asyncio" if sys.platform == "win32" else "uvloop",
+        "http": "httptools",
+        "workers": workers,
+    }
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(
-        "main:app", host=settings.babblr_api_host, port=settings.babblr_api_port, reload=True
-    )
+    uvicorn.run("main:app", **_uvicorn_options())
 
 
 def main():
     """Entry point for uv script."""
     import uvicorn
 
-    uvicorn.run(
-        "app.main:app", host=settings.babblr_api_host, port=settings.babblr_api_port, reload=True
-    )
+    uvicorn.run("app.main:app", **_uvicorn_options())
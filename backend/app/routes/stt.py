@@ -5,16 +5,17 @@ This module provides endpoints for speech-to-text transcription,
 language support information, and model availability.
 """
 
+import asyncio
 import logging
 import os
 import shutil
 import tempfile
 from datetime import datetime
-from pathlib import Path
-from typing import Optional
+from pathlib import Path, PurePosixPath
+from typing import Any, BinaryIO, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -23,17 +24,50 @@ from app.database.db import get_db
 from app.models.models import Conversation, Message
 from app.models.schemas import TranscriptionResponse
 from app.services.language_catalog import LANGUAGE_VARIANTS, list_locales
-from app.services.stt_correction_service import get_stt_correction_service
-from app.services.whisper_service import whisper_service
+from app.services.stt_correction_service import (
+    STT_CONTEXT_MESSAGES,
+    get_stt_correction_service,
+)
+from app.services.whisper_service import TranscriptionResult, whisper_service
 
 logger = logging.getLogger(__name__)
 
 # Configuration constants
 DEFAULT_TRANSCRIPTION_TIMEOUT = 30  # seconds
+UPLOAD_CHUNK_SIZE = 64 * 1024  # bytes read per chunk when spooling uploads to disk
+
+# Known transcription failures: (substring of the lowercased error, HTTP status, detail),
+# checked in order
+_TRANSCRIPTION_ERRORS = (
+    ("timed out", 408, "Transcription timed out. Please try with a shorter audio file."),
+    ("not installed", 503, "Speech-to-text service not available"),
+)
 
 router = APIRouter(prefix="/stt", tags=["speech-to-text"])
 
 
+def _select_upload_temp_dir() -> str | None:
+    """
+    Pick the directory for temporary upload files.
+
+    Prefers /dev/shm (Linux tmpfs) so the write and Whisper's ffmpeg read stay in
+    RAM. Utterances are small, so the memory cost is negligible.
+
+    Returns:
+        "/dev/shm" when available and writable, else None (the system default)
+    """
+    shm = "/dev/shm"
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return None
+
+
+_UPLOAD_TEMP_DIR = _select_upload_temp_dir()
+
+# Where uploads are kept in development mode (created at startup by init_audio_storage)
+_AUDIO_STORAGE_DIR = Path(settings.babblr_audio_storage_path)
+
+
 @router.post("/transcribe", response_model=TranscriptionResponse)
 async def transcribe_audio(
     audio: UploadFile = File(...),
@@ -74,12 +108,14 @@ async def transcribe_audio(
     if not audio.filename:
         raise HTTPException(status_code=400, detail="No file provided")
 
-    temp_file = None
+    temp_path: str | None = None
+    save_task: asyncio.Task[str | None] | None = None
     conversation = None
-    conversation_history = []
+    conversation_history: list[dict[str, str]] = []
 
     try:
-        # If a conversation_id is provided, validate it exists and fetch context
+        # If a conversation_id is provided, validate it exists (context is fetched
+        # later, concurrently with transcription)
         if conversation_id is not None:
             result = await db.execute(
                 select(Conversation).where(Conversation.id == conversation_id)
@@ -88,41 +124,39 @@ async def transcribe_audio(
             if not conversation:
                 raise HTTPException(status_code=404, detail="Conversation not found")
 
-            # Fetch conversation history for STT correction
-            messages_result = await db.execute(
-                select(Message)
-                .where(Message.conversation_id == conversation_id)
-                .order_by(Message.created_at)
-            )
-            messages = messages_result.scalars().all()
-            conversation_history = [
-                {"role": str(msg.role), "content": str(msg.content)} for msg in messages
-            ]
-
         # Create temp file
-        suffix = os.path.splitext(audio.filename)[1] or ".webm"
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+        suffix = PurePosixPath(audio.filename).suffix or ".webm"
+        fd, temp_path = tempfile.mkstemp(suffix=suffix, dir=_UPLOAD_TEMP_DIR)
+        # Close right away: the worker thread reopens by path, so no fd outlives a
+        # request that is cancelled before the copy starts
+        os.close(fd)
 
-        # Write uploaded content
-        content = await audio.read()
-        logger.debug("Audio file size: %d bytes", len(content))
+        # Spool the upload to disk off the event loop
+        total = await asyncio.to_thread(_spool_upload, audio.file, temp_path)
+        logger.debug("Audio file size: %d bytes", total)
 
-        if len(content) == 0:
+        if total == 0:
             raise HTTPException(status_code=400, detail="Empty audio file")
 
-        temp_file.write(content)
-        temp_file.close()
-
-        # Save file in development mode (for debugging/testing)
+        # Save file in development mode (for debugging/testing), in the background
+        # so it overlaps with transcription
         if settings.babblr_dev_mode:
-            await _save_audio_file(temp_file.name, audio.filename)
+            save_task = asyncio.create_task(
+                asyncio.to_thread(_save_audio_file, temp_path, audio.filename)
+            )
 
         logger.info("Starting transcription...")
 
-        # Transcribe with timeout
-        result = await whisper_service.transcribe(
-            temp_file.name, language=language, timeout=DEFAULT_TRANSCRIPTION_TIMEOUT
-        )
+        # Transcribe with timeout; the correction context doesn't depend on the audio,
+        # so load it from the database while Whisper runs
+        if conversation_id is not None:
+            result, conversation_history = await _transcribe_with_history(
+                temp_path, language, db, conversation_id
+            )
+        else:
+            result = await whisper_service.transcribe(
+                temp_path, language=language, timeout=DEFAULT_TRANSCRIPTION_TIMEOUT
+            )
 
         logger.info(
             "Transcription successful: language=%s, confidence=%.2f, duration=%.2fs",
@@ -176,37 +210,76 @@ async def transcribe_audio(
 
         # Provide more specific error messages
         error_msg = str(e)
-        if "timed out" in error_msg.lower():
-            raise HTTPException(
-                status_code=408,
-                detail="Transcription timed out. Please try with a shorter audio file.",
-            )
-        elif "not installed" in error_msg.lower():
-            raise HTTPException(status_code=503, detail="Speech-to-text service not available")
-        else:
-            raise HTTPException(status_code=500, detail=f"Transcription failed: {error_msg}")
+        lowered = error_msg.lower()
+        for needle, status_code, detail in _TRANSCRIPTION_ERRORS:
+            if needle in lowered:
+                raise HTTPException(status_code=status_code, detail=detail)
+        raise HTTPException(status_code=500, detail=f"Transcription failed: {error_msg}")
 
     finally:
+        # The dev-mode save reads the temp file; let it finish before deleting it
+        if save_task is not None:
+            await save_task
+
         # Clean up temp file
-        if temp_file and os.path.exists(temp_file.name):
+        if temp_path:
             try:
-                os.unlink(temp_file.name)
-                logger.debug("Cleaned up temporary file: %s", temp_file.name)
+                await asyncio.to_thread(os.unlink, temp_path)
+                logger.debug("Cleaned up temporary file: %s", temp_path)
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 logger.warning("Failed to delete temp file: %s", str(e))
 
 
-@router.get("/languages")
-async def get_supported_languages():
-    """
-    Get list of supported languages for speech-to-text.
-
-    Returns:
-        JSON object with supported languages and their codes
-    """
-    logger.debug("Getting supported languages")
-
-    supported_locales = list_locales(stt_only=True)
+# Whisper model details shown by /stt/models
+_MODEL_DETAILS: dict[str, dict[str, str]] = {
+    "tiny": {
+        "name": "tiny",
+        "parameters": "39M",
+        "vram": "~1GB",
+        "speed": "~10x faster",
+        "description": "Fastest, least accurate",
+    },
+    "base": {
+        "name": "base",
+        "parameters": "74M",
+        "vram": "~1GB",
+        "speed": "~7x faster",
+        "description": "Good balance (default)",
+    },
+    "small": {
+        "name": "small",
+        "parameters": "244M",
+        "vram": "~2GB",
+        "speed": "~4x faster",
+        "description": "Better accuracy",
+    },
+    "medium": {
+        "name": "medium",
+        "parameters": "769M",
+        "vram": "~5GB",
+        "speed": "~2x faster",
+        "description": "High accuracy",
+    },
+    "large": {
+        "name": "large",
+        "parameters": "1550M",
+        "vram": "~10GB",
+        "speed": "1x (baseline)",
+        "description": "Best accuracy, requires GPU",
+    },
+}
+
+_MODEL_NOTES = [
+    "Whisper model selection is not language-specific (models are multilingual).",
+    "You may pass a language hint as ISO-639-1 (e.g., 'en') or locale (e.g., 'en-GB'); locales map to ISO-639-1.",
+]
+
+
+def _build_languages_payload() -> dict[str, Any]:
+    """Build the /stt/languages response body from the language catalog."""
+    supported_locales = frozenset(list_locales(stt_only=True))
 
     languages = []
     for variant in LANGUAGE_VARIANTS:
@@ -224,12 +297,42 @@ async def get_supported_languages():
             }
         )
 
-    return JSONResponse(
-        content={
-            "languages": languages,
-            "count": len(languages),
-        }
-    )
+    return {
+        "languages": languages,
+        "count": len(languages),
+    }
+
+
+def _build_models_payload() -> dict[str, Any]:
+    """Build the /stt/models response body from the Whisper service."""
+    models = whisper_service.get_available_models()
+
+    return {
+        "models": [_MODEL_DETAILS.get(model, {"name": model}) for model in models],
+        "current_model": settings.whisper_model,
+        "device": whisper_service.device if hasattr(whisper_service, "device") else "unknown",
+        "multilingual": True,
+        "notes": _MODEL_NOTES,
+        "count": len(models),
+    }
+
+
+# The language catalog, configured model and device are fixed for the process
+# lifetime, so both info responses are serialized once at import.
+_LANGUAGES_PAYLOAD = orjson.dumps(_build_languages_payload())
+_MODELS_PAYLOAD = orjson.dumps(_build_models_payload())
+
+
+@router.get("/languages")
+async def get_supported_languages():
+    """
+    Get list of supported languages for speech-to-text.
+
+    Returns:
+        JSON object with supported languages and their codes
+    """
+    logger.debug("Getting supported languages")
+    return Response(content=_LANGUAGES_PAYLOAD, media_type="application/json")
 
 
 @router.get("/models")
@@ -241,68 +344,101 @@ async def get_available_models():
         JSON object with available models and current model
     """
     logger.debug("Getting available Whisper models")
+    return Response(content=_MODELS_PAYLOAD, media_type="application/json")
 
-    models = whisper_service.get_available_models()
-    current_model = settings.whisper_model
-
-    # Model details
-    model_details = {
-        "tiny": {
-            "name": "tiny",
-            "parameters": "39M",
-            "vram": "~1GB",
-            "speed": "~10x faster",
-            "description": "Fastest, least accurate",
-        },
-        "base": {
-            "name": "base",
-            "parameters": "74M",
-            "vram": "~1GB",
-            "speed": "~7x faster",
-            "description": "Good balance (default)",
-        },
-        "small": {
-            "name": "small",
-            "parameters": "244M",
-            "vram": "~2GB",
-            "speed": "~4x faster",
-            "description": "Better accuracy",
-        },
-        "medium": {
-            "name": "medium",
-            "parameters": "769M",
-            "vram": "~5GB",
-            "speed": "~2x faster",
-            "description": "High accuracy",
-        },
-        "large": {
-            "name": "large",
-            "parameters": "1550M",
-            "vram": "~10GB",
-            "speed": "1x (baseline)",
-            "description": "Best accuracy, requires GPU",
-        },
-    }
 
-    return JSONResponse(
-        content={
-            "models": [model_details.get(model, {"name": model}) for model in models],
-            "current_model": current_model,
-            "device": whisper_service.device if hasattr(whisper_service, "device") else "unknown",
-            "multilingual": True,
-            "notes": [
-                "Whisper model selection is not language-specific (models are multilingual).",
-                "You may pass a language hint as ISO-639-1 (e.g., 'en') or locale (e.g., 'en-GB'); locales map to ISO-639-1.",
-            ],
-            "count": len(models),
-        }
+async def _fetch_recent_history(db: AsyncSession, conversation_id: int) -> list[dict[str, str]]:
+    """
+    Fetch the recent messages used as STT correction context.
+
+    Args:
+        db: Database session
+        conversation_id: Conversation to read from
+
+    Returns:
+        Up to STT_CONTEXT_MESSAGES messages as role/content dicts, oldest first
+    """
+    # Newest first so LIMIT keeps the most recent ones, then back to chronological order
+    messages_result = await db.execute(
+        select(Message)
+        .where(Message.conversation_id == conversation_id)
+        .order_by(Message.created_at.desc(), Message.id.desc())
+        .limit(STT_CONTEXT_MESSAGES)
+    )
+    messages = messages_result.scalars().all()
+    return [{"role": str(msg.role), "content": str(msg.content)} for msg in reversed(messages)]
+
+
+async def _transcribe_with_history(
+    temp_path: str, language: Optional[str], db: AsyncSession, conversation_id: int
+) -> tuple[TranscriptionResult, list[dict[str, str]]]:
+    """
+    Run Whisper transcription and the correction-context query concurrently.
+
+    Neither task outlives this call. If transcription fails, the query is cancelled
+    and awaited, so nothing is left running on the request's session. The Whisper
+    task is always awaited to completion (cancelling it would not stop the executor
+    thread reading the temp file), so a query failure surfaces after it finishes.
+
+    Args:
+        temp_path: Path to the uploaded audio
+        language: Optional language hint
+        db: Database session
+        conversation_id: Conversation to read context from
+
+    Returns:
+        The transcription and the recent messages (oldest first)
+    """
+    transcription_task = asyncio.create_task(
+        whisper_service.transcribe(
+            temp_path, language=language, timeout=DEFAULT_TRANSCRIPTION_TIMEOUT
+        )
     )
+    history_task = asyncio.create_task(_fetch_recent_history(db, conversation_id))
+
+    try:
+        result = await transcription_task
+    except BaseException:
+        history_task.cancel()
+        await asyncio.gather(history_task, return_exceptions=True)
+        raise
+
+    conversation_history = await history_task
+    return result, conversation_history
+
+
+def _spool_upload(source: BinaryIO, dest_path: str) -> int:
+    """
+    Copy an uploaded file to dest_path in fixed-size chunks.
+
+    Blocking; run it in a worker thread from async code.
 
+    Args:
+        source: Uploaded file object (UploadFile.file)
+        dest_path: Path of the (already created) temporary file
 
-async def _save_audio_file(temp_path: str, original_filename: str) -> str | None:
+    Returns:
+        Number of bytes written
+    """
+    total = 0
+    with open(dest_path, "wb") as dest:
+        while chunk := source.read(UPLOAD_CHUNK_SIZE):
+            dest.write(chunk)
+            total += len(chunk)
+    return total
+
+
+def init_audio_storage() -> None:
+    """Create the development-mode audio storage directory (called once at startup)."""
+    _AUDIO_STORAGE_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def _save_audio_file(temp_path: str, original_filename: str) -> str | None:
     """
     Save audio file to storage in development mode.
 
+    Blocking; run it in a worker thread from async code.
+
     Args:
         temp_path: Path to temporary file
         original_filename: Original filename from upload
@@ -311,18 +447,17 @@ async def _save_audio_file(temp_path: str, original_filename: str) -> str | None
         Path to saved file, or None if saving failed
     """
     try:
-        # Create storage directory if it doesn't exist
-        storage_path = Path(settings.babblr_audio_storage_path)
-        storage_path.mkdir(parents=True, exist_ok=True)
-
         # Generate unique filename with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        ext = os.path.splitext(original_filename)[1]
+        ext = PurePosixPath(original_filename).suffix
         filename = f"audio_{timestamp}{ext}"
 
-        # Save file
-        dest_path = storage_path / filename
-        shutil.copy2(temp_path, dest_path)
+        # Save file: hard link when on the same filesystem, otherwise copy
+        dest_path = _AUDIO_STORAGE_DIR / filename
+        try:
+            os.link(temp_path, dest_path)
+        except OSError:
+            shutil.copy2(temp_path, dest_path)
 
         logger.info("Audio file saved in development mode: %s", dest_path)
         return str(dest_path)
@@ -15,6 +15,10 @@ from app.services.llm.exceptions import LLMError, ProviderUnavailableError
 
 logger = logging.getLogger(__name__)
 
+# Connection pool limits for the shared Ollama client. The provider instance is cached
+# by ProviderFactory, so every service reuses these kept-alive connections.
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=50, max_connections=100)
+
 # Language tutor system prompt template optimized for Ollama models
 TUTOR_PROMPT_TEMPLATE = """You are a friendly and encouraging {language} language tutor helping a {level} level student.
 
@@ -87,6 +91,7 @@ class OllamaProvider:
             self._client = httpx.AsyncClient(
                 base_url=self.base_url,
                 timeout=self.timeout,
+                limits=HTTP_LIMITS,
             )
         return self._client
 
@@ -10,15 +10,49 @@ conversation context. Unlike grammar correction, this focuses on:
 Example: "mi amo" vs "me llamo" when the tutor asked "¿Cómo te llamas?"
 """
 
+import copy
 import json
 import logging
+import re
+from collections import OrderedDict
+from collections.abc import Hashable
 from dataclasses import dataclass, field
+from string import Formatter
+from typing import Any
+
+import orjson
 
 from app.config import settings
 from app.services.llm.factory import ProviderFactory
 
 logger = logging.getLogger(__name__)
 
+# Number of recent messages used as correction context (last 3 exchanges)
+STT_CONTEXT_MESSAGES = 6
+
+# STT confidence at or above which correction is skipped (when the caller supplies one)
+HIGH_CONFIDENCE_THRESHOLD = 0.9
+
+# Max number of (text, context, language, level) corrections remembered per service
+CORRECTION_CACHE_SIZE = 1024
+
+# Max number of formatted conversation contexts remembered per service
+CONTEXT_CACHE_SIZE = 256
+
+# JSON object wrapped in a markdown code fence (```json ... ``` or ``` ... ```)
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+# Short replies that can't be meaningfully mis-recognized, so no LLM call is needed
+_COMMON_TRIVIAL_REPLIES = frozenset({"ok", "okay", "no"})
+_TRIVIAL_REPLIES: dict[str, frozenset[str]] = {
+    "spanish": frozenset({"sí", "si", "vale", "claro", "gracias", "muchas gracias"}),
+    "italian": frozenset({"sì", "si", "va bene", "certo", "grazie", "grazie mille"}),
+    "german": frozenset({"ja", "nein", "genau", "danke", "danke schön"}),
+    "french": frozenset({"oui", "non", "merci", "d'accord", "merci beaucoup"}),
+    "dutch": frozenset({"ja", "nee", "prima", "dank je", "dank u"}),
+    "english": frozenset({"yes", "yeah", "thanks", "thank you"}),
+}
+
 # Prompt for STT correction - focuses on recognition errors, not grammar
 STT_CORRECTION_PROMPT = """You are analyzing speech-to-text output for a {language} language learning conversation.
 The student is at {level} level and may have imperfect pronunciation.
@@ -60,6 +94,30 @@ Respond with a JSON object:
 If no corrections are needed, return an empty stt_corrections array.
 """
 
+# STT_CORRECTION_PROMPT split once into (literal, field name) pairs so each request
+# only joins strings instead of re-parsing the template with str.format
+_PROMPT_PARTS: tuple[tuple[str, str | None], ...] = tuple(
+    (literal, field_name) for literal, field_name, _, _ in Formatter().parse(STT_CORRECTION_PROMPT)
+)
+
+# Legacy difficulty levels mapped to CEFR ranges
+_LEGACY_LEVEL_MAP = {"BEGINNER": "A1-A2", "INTERMEDIATE": "B1-B2", "ADVANCED": "C1-C2"}
+
+
+def _render_correction_prompt(**values: str) -> str:
+    """Render STT_CORRECTION_PROMPT from the pre-parsed template parts.
+
+    Args:
+        **values: Values for the template fields.
+
+    Returns:
+        The rendered prompt, identical to STT_CORRECTION_PROMPT.format(**values).
+    """
+    return "".join(
+        literal + values[field_name] if field_name is not None else literal
+        for literal, field_name in _PROMPT_PARTS
+    )
+
 
 @dataclass
 class STTCorrectionResult:
@@ -82,13 +140,19 @@ class STTCorrectionService:
         """
         self._provider_name = provider_name
         self._provider = None
+        self._cache: OrderedDict[tuple[str, str, str, str], STTCorrectionResult] = OrderedDict()
+        self._context_cache: OrderedDict[tuple[tuple[str, str], ...], str] = OrderedDict()
 
     @property
     def provider(self):
-        """Lazy-load the LLM provider."""
-        if self._provider is None:
-            self._provider = ProviderFactory.get_provider(self._provider_name)
-        return self._provider
+        """Get the LLM provider.
+
+        Uses the instance cached by ProviderFactory (shared with other services and
+        their HTTP connection pools) unless a provider was set explicitly.
+        """
+        if self._provider is not None:
+            return self._provider
+        return ProviderFactory.get_provider(self._provider_name)
 
     async def correct_transcription(
         self,
@@ -96,14 +160,18 @@ class STTCorrectionService:
         conversation_history: list[dict[str, str]],
         language: str,
         difficulty_level: str = "A1",
+        confidence: float | None = None,
     ) -> STTCorrectionResult:
         """Correct STT output based on conversation context.
 
         Args:
             stt_text: Raw transcription from Whisper.
-            conversation_history: Recent conversation messages [{"role": "...", "content": "..."}].
+            conversation_history: Recent conversation messages [{"role": "...", "content": "..."}],
+                oldest first. Callers pass at most STT_CONTEXT_MESSAGES messages.
             language: Target language (e.g., "Spanish", "Italian").
             difficulty_level: CEFR level (A1-C2) or legacy level.
+            confidence: Optional STT confidence (0.0-1.0). At or above
+                HIGH_CONFIDENCE_THRESHOLD the text is returned unchanged.
 
         Returns:
             STTCorrectionResult with corrected text and list of corrections.
@@ -113,24 +181,45 @@ class STTCorrectionService:
                 original_text=stt_text, corrected_text=stt_text, corrections=[]
             )
 
-        # Format conversation context (last N messages)
-        context_messages = conversation_history[-6:]  # Last 3 exchanges
-        if context_messages:
-            context_lines = []
-            for msg in context_messages:
-                role = "Tutor" if msg["role"] == "assistant" else "Student"
-                context_lines.append(f"{role}: {msg['content']}")
-            conversation_context = "\n".join(context_lines)
-        else:
-            conversation_context = "(No previous conversation context)"
+        # Fast path: nothing worth sending to the LLM
+        if _is_trivial_reply(stt_text, language) or (
+            confidence is not None and confidence >= HIGH_CONFIDENCE_THRESHOLD
+        ):
+            return STTCorrectionResult(
+                original_text=stt_text, corrected_text=stt_text, corrections=[]
+            )
 
         # Normalize difficulty level
         level = difficulty_level.upper() if difficulty_level else "A1"
-        if level in ["BEGINNER", "INTERMEDIATE", "ADVANCED"]:
-            level_map = {"BEGINNER": "A1-A2", "INTERMEDIATE": "B1-B2", "ADVANCED": "C1-C2"}
-            level = level_map.get(level, "A1-A2")
+        level = _LEGACY_LEVEL_MAP.get(level, level)
+
+        # Same STT text in reply to the same tutor message gives the same correction
+        last_tutor_message = next(
+            (
+                msg["content"]
+                for msg in reversed(conversation_history)
+                if msg["role"] == "assistant"
+            ),
+            "",
+        )
+        cache_key = (stt_text, last_tutor_message, language, level)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self._cache.move_to_end(cache_key)
+            # Copy so callers can't mutate the cached entry (e.g. its corrections list)
+            return copy.deepcopy(cached)
+
+        # Format conversation context; unchanged until a new message is added. Keyed on
+        # the messages themselves (not database IDs, which SQLite reuses after deletes)
+        context_key = tuple((msg["role"], msg["content"]) for msg in conversation_history)
+        conversation_context = self._context_cache.get(context_key)
+        if conversation_context is None:
+            conversation_context = _format_context(conversation_history)
+            _lru_put(self._context_cache, context_key, conversation_context, CONTEXT_CACHE_SIZE)
+        else:
+            self._context_cache.move_to_end(context_key)
 
-        prompt = STT_CORRECTION_PROMPT.format(
+        prompt = _render_correction_prompt(
             language=language,
             level=level,
             conversation_context=conversation_context,
@@ -145,8 +234,15 @@ class STTCorrectionService:
                 temperature=0.2,  # Low temperature for consistent corrections
             )
 
-            # Parse JSON response
-            result = self._parse_response(response.content, stt_text)
+            # Parse JSON response; only successfully parsed results are cached, so one
+            # malformed reply doesn't disable correction for this text and context
+            result = self._try_parse_response(response.content, stt_text)
+            if result is not None:
+                _lru_put(self._cache, cache_key, copy.deepcopy(result), CORRECTION_CACHE_SIZE)
+            else:
+                result = STTCorrectionResult(
+                    original_text=stt_text, corrected_text=stt_text, corrections=[]
+                )
 
             # Log corrections in dev mode
             if settings.babblr_dev_mode and result.corrections:
@@ -174,17 +270,31 @@ class STTCorrectionService:
             original_text: Original STT text (fallback).
 
         Returns:
-            Parsed STTCorrectionResult.
+            Parsed STTCorrectionResult, or the original text unchanged if parsing fails.
+        """
+        result = self._try_parse_response(content, original_text)
+        if result is None:
+            return STTCorrectionResult(
+                original_text=original_text, corrected_text=original_text, corrections=[]
+            )
+        return result
+
+    def _try_parse_response(self, content: str, original_text: str) -> STTCorrectionResult | None:
+        """Parse the LLM response JSON, signalling failure instead of falling back.
+
+        Args:
+            content: Raw LLM response content.
+            original_text: Original STT text (default for missing fields).
+
+        Returns:
+            Parsed STTCorrectionResult, or None if the response is not valid JSON.
         """
         try:
             # Try to extract JSON from response (handle markdown code blocks)
-            json_str = content.strip()
-            if "```json" in json_str:
-                json_str = json_str.split("```json")[1].split("```")[0].strip()
-            elif "```" in json_str:
-                json_str = json_str.split("```")[1].split("```")[0].strip()
+            match = _JSON_FENCE_RE.search(content)
+            json_str = match.group(1) if match else content.strip()
 
-            data = json.loads(json_str)
+            data = orjson.loads(json_str)
 
             return STTCorrectionResult(
                 original_text=original_text,
@@ -192,11 +302,52 @@ class STTCorrectionService:
                 corrections=data.get("stt_corrections", []),
                 confidence=data.get("confidence", 1.0),
             )
-        except (json.JSONDecodeError, KeyError, IndexError) as e:
+        except (orjson.JSONDecodeError, KeyError, IndexError) as e:
             logger.warning("Failed to parse STT correction response: %s", str(e))
-            return STTCorrectionResult(
-                original_text=original_text, corrected_text=original_text, corrections=[]
-            )
+            return None
+
+
+def _format_context(conversation_history: list[dict[str, str]]) -> str:
+    """Format conversation messages as "Tutor: ..." / "Student: ..." lines.
+
+    Args:
+        conversation_history: Messages [{"role": "...", "content": "..."}], oldest first.
+
+    Returns:
+        The formatted context, or a placeholder when there are no messages.
+    """
+    if not conversation_history:
+        return "(No previous conversation context)"
+    return "\n".join(
+        f"{'Tutor' if msg['role'] == 'assistant' else 'Student'}: {msg['content']}"
+        for msg in conversation_history
+    )
+
+
+def _lru_put(cache: OrderedDict, key: Hashable, value: Any, maxsize: int) -> None:
+    """Insert into an OrderedDict used as an LRU cache, evicting the oldest entry."""
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > maxsize:
+        cache.popitem(last=False)
+
+
+def _is_trivial_reply(stt_text: str, language: str) -> bool:
+    """Check whether the text is a short stock reply (e.g. "sí", "ok") in the language.
+
+    Args:
+        stt_text: Raw transcription.
+        language: Target language name (e.g., "Spanish").
+
+    Returns:
+        True if the text is at most two words and a known trivial reply.
+    """
+    if len(stt_text.split()) > 2:
+        return False
+    normalized = stt_text.strip().strip(".,!?¡¿").strip().lower()
+    return normalized in _COMMON_TRIVIAL_REPLIES or normalized in _TRIVIAL_REPLIES.get(
+        language.lower(), frozenset()
+    )
 
 
 # Singleton instance
@@ -237,6 +237,16 @@ class TestSTTCorrectionService:
         service2 = get_stt_correction_service()
         assert service1 is service2
 
+    def test_provider_is_shared_with_factory(self):
+        """The correction service should use the factory's cached provider instance."""
+        from app.services.llm import ProviderFactory
+        from app.services.stt_correction_service import STTCorrectionService
+
+        ProviderFactory.clear_cache()
+        service = STTCorrectionService(provider_name="mock")
+        assert service.provider is ProviderFactory.get_provider("mock")
+        ProviderFactory.clear_cache()
+
     def test_parse_response_valid_json(self):
         """Test _parse_response with valid JSON."""
         from app.services.stt_correction_service import STTCorrectionService
@@ -263,6 +273,37 @@ class TestSTTCorrectionService:
         assert result.corrected_text == "me llamo"
         assert result.corrections == []
 
+    def test_parse_response_fenced_json_with_surrounding_text(self):
+        """Test _parse_response with prose around a fenced JSON object with nested objects."""
+        from app.services.stt_correction_service import STTCorrectionService
+
+        service = STTCorrectionService()
+        content = """Here is the analysis:
+```
+{"corrected_text": "me llamo", "stt_corrections": [{"original": "mi amo", "corrected": "me llamo", "reason": "Homophone"}], "confidence": 0.8}
+```
+Hope this helps."""
+        result = service._parse_response(content, "mi amo")
+
+        assert result.corrected_text == "me llamo"
+        assert result.corrections[0]["original"] == "mi amo"
+        assert result.confidence == 0.8
+
+    def test_render_correction_prompt_matches_format(self):
+        """Pre-parsed prompt rendering should match str.format, including braces in values."""
+        from app.services.stt_correction_service import (
+            STT_CORRECTION_PROMPT,
+            _render_correction_prompt,
+        )
+
+        values = {
+            "language": "Spanish",
+            "level": "A1-A2",
+            "conversation_context": "Tutor: ¿Cómo te llamas? {nombre}",
+            "stt_text": "mi amo Ana",
+        }
+        assert _render_correction_prompt(**values) == STT_CORRECTION_PROMPT.format(**values)
+
     def test_parse_response_invalid_json(self):
         """Test _parse_response with invalid JSON returns original text."""
         from app.services.stt_correction_service import STTCorrectionService
@@ -274,3 +315,579 @@ class TestSTTCorrectionService:
         assert result.original_text == "original text"
         assert result.corrected_text == "original text"
         assert result.corrections == []
+
+
+class TestHealthCheck:
+    """Test the cached /health endpoint."""
+
+    def _reset_cache(self):
+        from app import main
+
+        main._health_cache.update({"value": None, "expires": 0.0, "stale": None})
+        main._ollama_breaker.update({"failures": 0, "open_until": 0.0})
+
+    async def test_health_payload_is_cached(self):
+        """Repeated polls within the TTL should probe Ollama only once."""
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        from app import main
+
+        self._reset_cache()
+        ollama = MagicMock()
+        ollama.list_models = AsyncMock(return_value=["llama3.2:latest"])
+
+        with patch.object(main.ProviderFactory, "get_provider", return_value=ollama):
+            first = await main.health_check()
+            second = await main.health_check()
+
+        assert first is second
+        assert first["services"]["ollama"]["available_models"] == ["llama3.2:latest"]
+        ollama.list_models.assert_awaited_once()
+        self._reset_cache()
+
+    async def test_health_falls_back_to_stale_payload(self):
+        """A failed Ollama probe should reuse the last good payload as degraded."""
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        from app import main
+
+        self._reset_cache()
+        ollama = MagicMock()
+        ollama.list_models = AsyncMock(side_effect=[["llama3.2:latest"], ConnectionError()])
+
+        with patch.object(main.ProviderFactory, "get_provider", return_value=ollama):
+            await main.health_check()
+            main._health_cache["expires"] = 0.0
+            degraded = await main.health_check()
+
+        assert degraded["status"] == "degraded"
+        assert degraded["services"]["ollama"]["available_models"] == ["llama3.2:latest"]
+        self._reset_cache()
+
+    async def test_ollama_breaker_opens_after_repeated_failures(self):
+        """After repeated probe failures, Ollama should not be probed during the cooldown."""
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        from app import main
+
+        self._reset_cache()
+        ollama = MagicMock()
+        ollama.list_models = AsyncMock(side_effect=ConnectionError())
+
+        with patch.object(main.ProviderFactory, "get_provider", return_value=ollama):
+            for _ in range(main.OLLAMA_BREAKER_THRESHOLD + 2):
+                main._health_cache["expires"] = 0.0
+                payload = await main.health_check()
+
+        assert ollama.list_models.await_count == main.OLLAMA_BREAKER_THRESHOLD
+        assert payload["services"]["ollama"]["available_models"] is None
+        self._reset_cache()
+
+    def test_health_live_is_static(self):
+        """The liveness probe should answer without probing any service."""
+        from unittest.mock import patch
+
+        from fastapi.testclient import TestClient
+
+        from app import main
+
+        with patch.object(main.ProviderFactory, "get_provider") as get_provider:
+            response = TestClient(main.app).get("/health/live")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+        get_provider.assert_not_called()
+
+
+class TestSTTInfoRoutes:
+    """Test the precomputed /stt info responses."""
+
+    def test_languages_payload_matches_catalog(self):
+        """Cached /stt/languages body should list exactly the STT locales."""
+        import orjson
+
+        from app.routes import stt
+        from app.services.language_catalog import list_locales
+
+        data = orjson.loads(stt._LANGUAGES_PAYLOAD)
+        assert data["count"] == len(data["languages"])
+        assert sorted(lang["locale"] for lang in data["languages"]) == list_locales(stt_only=True)
+
+    def test_models_payload_includes_details(self):
+        """Cached /stt/models body should include details for known models."""
+        import orjson
+
+        from app.routes import stt
+
+        data = orjson.loads(stt._MODELS_PAYLOAD)
+        names = [model["name"] for model in data["models"]]
+        assert "base" in names
+        assert data["models"][names.index("base")]["parameters"] == "74M"
+        assert data["count"] == len(data["models"])
+
+
+class TestTranscribeRoute:
+    """Test the /stt/transcribe upload handling."""
+
+    def test_transcribe_spools_upload_to_disk(self):
+        """The whole upload should reach Whisper via the temp file."""
+        from pathlib import Path
+        from unittest.mock import AsyncMock, patch
+
+        from fastapi.testclient import TestClient
+
+        from app import main
+        from app.routes import stt
+        from app.services.whisper_service import TranscriptionResult
+
+        audio = b"\x1a\x45\xdf\xa3" * 50_000  # spans several upload chunks
+        seen: dict = {}
+
+        async def fake_transcribe(path, language=None, timeout=30):
+            seen["content"] = Path(path).read_bytes()
+            seen["path"] = path
+            return TranscriptionResult(text="hola", language="es", confidence=0.9, duration=1.0)
+
+        with patch.object(
+            stt.whisper_service, "transcribe", AsyncMock(side_effect=fake_transcribe)
+        ):
+            response = TestClient(main.app).post(
+                "/stt/transcribe", files={"audio": ("clip.webm", audio, "audio/webm")}
+            )
+
+        assert response.status_code == 200
+        assert response.json()["text"] == "hola"
+        assert seen["content"] == audio
+        assert seen["path"].endswith(".webm")
+        if stt._UPLOAD_TEMP_DIR:
+            assert seen["path"].startswith(stt._UPLOAD_TEMP_DIR)
+        assert not Path(seen["path"]).exists()
+
+    def test_transcribe_saves_audio_in_dev_mode(self, tmp_path):
+        """In dev mode the upload should be kept in the audio storage directory."""
+        from unittest.mock import AsyncMock, patch
+
+        from fastapi.testclient import TestClient
+
+        from app import main
+        from app.routes import stt
+        from app.services.whisper_service import TranscriptionResult
+
+        transcription = TranscriptionResult(
+            text="hola", language="es", confidence=0.9, duration=1.0
+        )
+        with (
+            patch.object(stt.settings, "babblr_dev_mode", True),
+            patch.object(stt, "_AUDIO_STORAGE_DIR", tmp_path),
+            patch.object(stt.whisper_service, "transcribe", AsyncMock(return_value=transcription)),
+        ):
+            response = TestClient(main.app).post(
+                "/stt/transcribe", files={"audio": ("clip.webm", b"audio", "audio/webm")}
+            )
+
+        assert response.status_code == 200
+        saved = list(tmp_path.glob("audio_*.webm"))
+        assert len(saved) == 1
+        assert saved[0].read_bytes() == b"audio"
+
+    def test_transcribe_maps_known_errors(self):
+        """Known Whisper failures should map to specific HTTP statuses."""
+        from unittest.mock import AsyncMock, patch
+
+        from fastapi.testclient import TestClient
+
+        from app import main
+        from app.routes import stt
+
+        cases = [
+            ("Transcription timed out after 30 seconds", 408),
+            ("Whisper is not installed or failed to load", 503),
+            ("ffmpeg exploded", 500),
+        ]
+        client = TestClient(main.app)
+        for message, status_code in cases:
+            with patch.object(
+                stt.whisper_service, "transcribe", AsyncMock(side_effect=Exception(message))
+            ):
+                response = client.post(
+                    "/stt/transcribe", files={"audio": ("clip.webm", b"audio", "audio/webm")}
+                )
+            assert response.status_code == status_code
+
+    def test_transcribe_rejects_empty_upload(self):
+        """An empty upload should be rejected with 400."""
+        from fastapi.testclient import TestClient
+
+        from app import main
+
+        response = TestClient(main.app).post(
+            "/stt/transcribe", files={"audio": ("clip.webm", b"", "audio/webm")}
+        )
+        assert response.status_code == 400
+
+    @staticmethod
+    def _seeded_db():
+        """Yield (session, conversation_id) for an in-memory DB with 10 messages."""
+        from contextlib import asynccontextmanager
+        from datetime import datetime, timedelta
+
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+        from app.database.db import Base
+        from app.models.models import Conversation, Message
+
+        @asynccontextmanager
+        async def seeded_db():
+            engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+
+            async with AsyncSession(engine, expire_on_commit=False) as db:
+                conversation = Conversation(language="spanish", difficulty_level="A1")
+                db.add(conversation)
+                await db.flush()
+                start = datetime(2025, 1, 1)
+                for i in range(10):
+                    db.add(
+                        Message(
+                            conversation_id=conversation.id,
+                            role="assistant" if i % 2 else "user",
+                            content=f"message {i}",
+                            created_at=start + timedelta(seconds=i),
+                        )
+                    )
+                await db.commit()
+                yield db, conversation.id
+
+            await engine.dispose()
+
+        return seeded_db()
+
+    async def test_transcribe_passes_recent_context_in_order(self):
+        """Only the most recent messages, oldest first, should reach STT correction."""
+        import io
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        from fastapi import UploadFile
+
+        from app.routes import stt
+        from app.services.stt_correction_service import STT_CONTEXT_MESSAGES, STTCorrectionResult
+        from app.services.whisper_service import TranscriptionResult
+
+        correction_service = MagicMock()
+        correction_service.correct_transcription = AsyncMock(
+            return_value=STTCorrectionResult(original_text="hola", corrected_text="hola")
+        )
+        transcription = TranscriptionResult(
+            text="hola", language="es", confidence=0.5, duration=1.0
+        )
+
+        async with self._seeded_db() as (db, conversation_id):
+            with (
+                patch.object(
+                    stt.whisper_service, "transcribe", AsyncMock(return_value=transcription)
+                ),
+                patch.object(stt, "get_stt_correction_service", return_value=correction_service),
+            ):
+                await stt.transcribe_audio(
+                    audio=UploadFile(file=io.BytesIO(b"audio"), filename="clip.webm"),
+                    language=None,
+                    conversation_id=conversation_id,
+                    db=db,
+                )
+
+        history = correction_service.correct_transcription.await_args.kwargs["conversation_history"]
+        assert [msg["content"] for msg in history] == [
+            f"message {i}" for i in range(10 - STT_CONTEXT_MESSAGES, 10)
+        ]
+
+    async def test_failed_transcription_leaves_no_pending_tasks(self):
+        """A Whisper failure should cancel the context query before the handler returns."""
+        import asyncio
+        import io
+        from unittest.mock import AsyncMock, patch
+
+        import pytest
+        from fastapi import HTTPException, UploadFile
+
+        from app.routes import stt
+
+        async with self._seeded_db() as (db, conversation_id):
+            with patch.object(
+                stt.whisper_service,
+                "transcribe",
+                AsyncMock(side_effect=Exception("Whisper is not installed")),
+            ):
+                with pytest.raises(HTTPException) as exc_info:
+                    await stt.transcribe_audio(
+                        audio=UploadFile(file=io.BytesIO(b"audio"), filename="clip.webm"),
+                        language=None,
+                        conversation_id=conversation_id,
+                        db=db,
+                    )
+
+            pending = [
+                task
+                for task in asyncio.all_tasks()
+                if task is not asyncio.current_task() and not task.done()
+            ]
+
+        assert exc_info.value.status_code == 503
+        assert pending == []
+
+    async def test_failed_context_query_waits_for_transcription(self):
+        """A context query failure should surface only after Whisper has finished."""
+        import asyncio
+        import io
+        from unittest.mock import AsyncMock, patch
+
+        import pytest
+        from fastapi import HTTPException, UploadFile
+
+        from app.routes import stt
+        from app.services.whisper_service import TranscriptionResult
+
+        finished = asyncio.Event()
+
+        async def slow_transcribe(path, language=None, timeout=30):
+            await asyncio.sleep(0.05)
+            finished.set()
+            return TranscriptionResult(text="hola", language="es", confidence=0.5, duration=1.0)
+
+        async with self._seeded_db() as (db, conversation_id):
+            with (
+                patch.object(
+                    stt.whisper_service, "transcribe", AsyncMock(side_effect=slow_transcribe)
+                ),
+                patch.object(
+                    stt, "_fetch_recent_history", AsyncMock(side_effect=RuntimeError("db down"))
+                ),
+            ):
+                with pytest.raises(HTTPException) as exc_info:
+                    await stt.transcribe_audio(
+                        audio=UploadFile(file=io.BytesIO(b"audio"), filename="clip.webm"),
+                        language=None,
+                        conversation_id=conversation_id,
+                        db=db,
+                    )
+
+        assert exc_info.value.status_code == 500
+        assert finished.is_set()
+
+
+class TestFavicon:
+    """Test favicon caching."""
+
+    def test_favicon_routes_serve_cached_svg(self):
+        """Both favicon routes should return the SVG with long-lived cache headers."""
+        from fastapi.testclient import TestClient
+
+        from app import main
+
+        client = TestClient(main.app)
+        for path in ("/favicon.svg", "/favicon.ico"):
+            response = client.get(path, follow_redirects=False)
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "image/svg+xml"
+            assert "immutable" in response.headers["cache-control"]
+            assert response.content == main._FAVICON_BYTES
+
+    def test_favicon_not_modified(self):
+        """A matching If-None-Match should get an empty 304."""
+        from fastapi.testclient import TestClient
+
+        from app import main
+
+        etag = main._FAVICON_HEADERS["ETag"]
+        response = TestClient(main.app).get("/favicon.svg", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+
+class TestCORS:
+    """Test CORS preflight configuration."""
+
+    def test_preflight_is_cacheable(self):
+        """Preflight responses should carry Access-Control-Max-Age."""
+        from fastapi.testclient import TestClient
+
+        from app import main
+
+        response = TestClient(main.app).options(
+            "/stt/transcribe",
+            headers={
+                "Origin": "http://localhost:5173",
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "content-type",
+            },
+        )
+        assert response.status_code == 200
+        assert response.headers["access-control-max-age"] == "86400"
+        assert "DELETE" in response.headers["access-control-allow-methods"]
+
+
+class TestSTTCorrectionFastPaths:
+    """Test cases where STT correction avoids calling the LLM."""
+
+    def _service_with_provider(self, content: str):
+        from unittest.mock import AsyncMock, MagicMock
+
+        from app.services.llm.base import LLMResponse
+        from app.services.stt_correction_service import STTCorrectionService
+
+        service = STTCorrectionService()
+        provider = MagicMock()
+        provider.generate = AsyncMock(return_value=LLMResponse(content=content, model="mock"))
+        service._provider = provider
+        return service, provider
+
+    async def test_trivial_reply_skips_llm(self):
+        """Stock one-word replies should be returned unchanged without an LLM call."""
+        service, provider = self._service_with_provider("{}")
+        history = [{"role": "assistant", "content": "¿Te gusta el café?"}]
+
+        result = await service.correct_transcription("¡Sí!", history, language="Spanish")
+
+        assert result.corrected_text == "¡Sí!"
+        assert result.corrections == []
+        provider.generate.assert_not_awaited()
+
+    async def test_high_confidence_skips_llm(self):
+        """A caller-supplied confidence above the threshold should skip correction."""
+        service, provider = self._service_with_provider("{}")
+        history = [{"role": "assistant", "content": "¿Cómo te llamas?"}]
+
+        result = await service.correct_transcription(
+            "mi amo Ana", history, language="Spanish", confidence=0.95
+        )
+
+        assert result.corrected_text == "mi amo Ana"
+        provider.generate.assert_not_awaited()
+
+    async def test_repeated_correction_is_cached(self):
+        """The same text in reply to the same tutor message should hit the LLM once."""
+        service, provider = self._service_with_provider(
+            '{"corrected_text": "me llamo Ana", "stt_corrections": [], "confidence": 0.9}'
+        )
+        history = [{"role": "assistant", "content": "¿Cómo te llamas?"}]
+
+        first = await service.correct_transcription("mi amo Ana", history, language="Spanish")
+        second = await service.correct_transcription("mi amo Ana", history, language="Spanish")
+
+        assert first.corrected_text == second.corrected_text == "me llamo Ana"
+        provider.generate.assert_awaited_once()
+
+    async def test_cached_correction_is_copied(self):
+        """Mutating a returned result must not change what later callers get."""
+        service, _ = self._service_with_provider(
+            '{"corrected_text": "me llamo Ana", "stt_corrections": '
+            '[{"original": "mi amo", "corrected": "me llamo", "reason": "Homophone"}]}'
+        )
+        history = [{"role": "assistant", "content": "¿Cómo te llamas?"}]
+
+        first = await service.correct_transcription("mi amo Ana", history, language="Spanish")
+        first.corrections.clear()
+        second = await service.correct_transcription("mi amo Ana", history, language="Spanish")
+        second.corrections[0]["reason"] = "changed"
+        third = await service.correct_transcription("mi amo Ana", history, language="Spanish")
+
+        assert third.corrections == [
+            {"original": "mi amo", "corrected": "me llamo", "reason": "Homophone"}
+        ]
+
+    async def test_unparseable_reply_is_not_cached(self):
+        """A malformed LLM reply should not stop the next call from retrying."""
+        from unittest.mock import AsyncMock
+
+        from app.services.llm.base import LLMResponse
+
+        service, provider = self._service_with_provider("not json")
+        provider.generate = AsyncMock(
+            side_effect=[
+                LLMResponse(content="not json", model="mock"),
+                LLMResponse(content='{"corrected_text": "me llamo Ana"}', model="mock"),
+            ]
+        )
+        history = [{"role": "assistant", "content": "¿Cómo te llamas?"}]
+
+        first = await service.correct_transcription("mi amo Ana", history, language="Spanish")
+        second = await service.correct_transcription("mi amo Ana", history, language="Spanish")
+
+        assert first.corrected_text == "mi amo Ana"
+        assert second.corrected_text == "me llamo Ana"
+        assert provider.generate.await_count == 2
+
+    async def test_formatted_context_is_reused(self):
+        """The same recent messages should be formatted only once."""
+        from unittest.mock import patch
+
+        from app.services import stt_correction_service
+
+        service, _ = self._service_with_provider("{}")
+        history = [
+            {"role": "assistant", "content": "¿Cómo te llamas?"},
+            {"role": "user", "content": "Ana"},
+        ]
+
+        with patch.object(
+            stt_correction_service,
+            "_format_context",
+            wraps=stt_correction_service._format_context,
+        ) as format_context:
+            for text in ("mi amo Ana", "me amo Ana"):
+                await service.correct_transcription(text, history, language="Spanish")
+
+        format_context.assert_called_once_with(history)
+
+    async def test_context_cache_follows_message_content(self):
+        """A different history must never reuse another conversation's cached context.
+
+        Message IDs can be reused by SQLite after a conversation is deleted, so the
+        cache must not treat matching IDs as matching context.
+        """
+        service, provider = self._service_with_provider("{}")
+        old_history = [
+            {"role": "assistant", "content": "¿De dónde eres?"},
+            {"role": "user", "content": "Soy de Madrid"},
+        ]
+        new_history = [
+            {"role": "assistant", "content": "¿Cómo te llamas?"},
+            {"role": "user", "content": "Ana"},
+        ]
+
+        await service.correct_transcription("mi amo Ana", old_history, language="Spanish")
+        await service.correct_transcription("mi amo Ana", new_history, language="Spanish")
+
+        prompt = provider.generate.await_args.kwargs["messages"][0]["content"]
+        assert "Tutor: ¿Cómo te llamas?\nStudent: Ana" in prompt
+        assert "Madrid" not in prompt
+
+
+class TestServerOptions:
+    """Test uvicorn launch options."""
+
+    def test_dev_mode_uses_reload(self):
+        """Development mode should run a single auto-reloading server."""
+        from unittest.mock import patch
+
+        from app import main
+
+        with patch.object(main.settings, "babblr_dev_mode", True):
+            options = main._uvicorn_options()
+        assert options["reload"] is True
+        assert "workers" not in options
+
+    def test_production_uses_workers_and_fast_parsers(self):
+        """Outside dev mode, reload is off and worker count comes from settings."""
+        from unittest.mock import patch
+
+        from app import main
+
+        with (
+            patch.object(main.settings, "babblr_dev_mode", False),
+            patch.object(main.settings, "babblr_api_workers", 4),
+        ):
+            options = main._uvicorn_options()
+        assert options["reload"] is False
+        assert options["workers"] == 4
+        assert options["http"] == "httptools"